@@ -7,6 +7,11 @@ class Settings(BaseSettings):
     MAX_PAGES: int = 10
     LOG_LEVEL: str = "INFO"
     SERPAPI_KEY: str | None = None
+    WORKERS: int = 0                # launcher only; 0 = sized from available cores
+    PARSE_PROCESSES: int = 0        # 0 = parse inline in the request thread
+    CACHE_PATH: str | None = None   # SQLite file shared by all workers
+    CACHE_TTL: int = 900
+    METRICS_FLUSH_INTERVAL: int = 5
     class Config:
         env_file = ".env"
 
@@ -1,10 +1,14 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, HttpUrl
 from .models import BrandContext
 from .scraper.shopify_scraper import analyze_store
 from .scraper.competitor_finder import guess_competitors
 from .config import settings
+from .db import session as db_session
 from .db.session import init_engine
+from .utils import cache
+from .utils.pool import init_pool, shutdown_pool
 from .db.models import Base as SA_Base, Brand as SA_Brand, Product as SA_Product, FAQ as SA_FAQ
 from sqlalchemy.orm import Session
 
@@ -18,48 +22,76 @@ class AnalyzeRequest(BaseModel):
 class AnalyzeResponse(BrandContext):
     competitor_contexts: list[BrandContext] = []
 
+async def _flush_metrics_periodically():
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        await asyncio.to_thread(cache.flush_metrics)
+
 @app.on_event("startup")
-def startup():
+async def startup():
+    # Runs once per worker process: each worker gets its own DB engine and parse
+    # pool, while the page cache and counters live in the shared SQLite file.
+    cache.init_cache(settings.CACHE_PATH, settings.CACHE_TTL)
+    init_pool(settings.PARSE_PROCESSES)
     engine, _ = init_engine()
     if engine:
         SA_Base.metadata.create_all(engine)
+    app.state.metrics_flusher = asyncio.create_task(_flush_metrics_periodically())
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.metrics_flusher.cancel()
+    cache.flush_metrics()
+    cache.close()
+    shutdown_pool()
+    if db_session.engine:
+        db_session.engine.dispose()
+
+@app.get("/metrics")
+def metrics() -> dict[str, int]:
+    return cache.metrics()
 
 @app.post("/analyze", response_model=AnalyzeResponse, responses={401: {"description":"Website not found"}, 500:{"description":"Internal error"}})
-def analyze(req: AnalyzeRequest):
+async def analyze(req: AnalyzeRequest):
+    cache.incr('analyze_requests')
     try:
-        ctx = analyze_store(str(req.website_url), include_competitors=False)
+        ctx = await analyze_store(str(req.website_url), include_competitors=False)
     except FileNotFoundError as e:
+        cache.incr('analyze_not_found')
         raise HTTPException(status_code=401, detail=str(e))
     except Exception as e:
+        cache.incr('analyze_errors')
         raise HTTPException(status_code=500, detail=str(e))
 
     if req.persist and settings.MYSQL_URL:
-        engine, SessionLocal = init_engine()
-        if not engine or not SessionLocal:
+        if not db_session.SessionLocal:
             raise HTTPException(status_code=500, detail="DB not initialized")
-        with SessionLocal() as db:
-            _persist(db, ctx)
+        await asyncio.to_thread(_save, ctx)
 
     # --- BONUS: competitor analysis ---
     comp_contexts = []
     if req.include_competitors:
-        comp_sites = guess_competitors(ctx.brand or "", str(ctx.website_url), max_results=3)
-        for comp in comp_sites:
-            try:
-                cctx = analyze_store(comp, include_competitors=False)
-                comp_contexts.append(cctx)
-                if req.persist and settings.MYSQL_URL:
-                    engine, SessionLocal = init_engine()
-                    if engine and SessionLocal:
-                        with SessionLocal() as db:
-                            _persist(db, cctx)
-            except Exception:
-                # ignore individual competitor failures
-                pass
+        comp_sites = await asyncio.to_thread(guess_competitors, ctx.brand or "", str(ctx.website_url), max_results=3)
+        results = await asyncio.gather(
+            *(analyze_store(comp, include_competitors=False) for comp in comp_sites),
+            return_exceptions=True,
+        )
+        # ignore individual competitor failures
+        comp_contexts = [c for c in results if isinstance(c, BrandContext)]
+        if req.persist and db_session.SessionLocal:
+            for cctx in comp_contexts:
+                try:
+                    await asyncio.to_thread(_save, cctx)
+                except Exception:
+                    pass
 
     resp = ctx.model_copy(update={"competitor_contexts": comp_contexts})
     return resp
 
+def _save(ctx: BrandContext):
+    with db_session.SessionLocal() as db:
+        _persist(db, ctx)
+
 def _persist(db: Session, ctx: BrandContext):
     brand = db.query(SA_Brand).filter(SA_Brand.website_url == str(ctx.website_url)).one_or_none()
     if not brand:
@@ -1,13 +1,15 @@
 from __future__ import annotations
-import re, json, time
+import asyncio, re, json
 from typing import Optional, List
 from urllib.parse import urljoin, urlparse
 import tldextract
-import requests
+import httpx
 from bs4 import BeautifulSoup
 from ..config import settings
 from ..models import Product, FAQ, PolicyLinks, SocialHandles, Contact, ImportantLinks, BrandContext
 from ..utils.text import clean_text, extract_emails, extract_phones, find_faq_pairs
+from ..utils.pool import run_cpu
+from ..utils import cache
 
 HEADERS = {
     'User-Agent': settings.USER_AGENT,
@@ -27,9 +29,11 @@ SOCIAL_DOMAINS = {
     'linkedin.com': 'linkedin',
 }
 
-def _get(url: str, **kwargs) -> requests.Response:
-    timeout = kwargs.pop('timeout', settings.REQUEST_TIMEOUT)
-    return requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True, **kwargs)
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(headers=HEADERS, timeout=settings.REQUEST_TIMEOUT, follow_redirects=True)
+
+async def _get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    return await client.get(url, **kwargs)
 
 def normalize_base(url: str) -> str:
     if not url.startswith('http'):
@@ -42,12 +46,12 @@ def is_shopify_store(html: str) -> bool:
     tl = html.lower()
     return any(h.lower() in tl for h in hints)
 
-def paginate_products_json(base: str, limit: int = 250, max_pages: int = 50) -> List[dict]:
+async def paginate_products_json(client: httpx.AsyncClient, base: str, limit: int = 250, max_pages: int = 50) -> List[dict]:
     products = []
     page = 1
     while page <= max_pages:
         url = f"{base}/products.json?limit={limit}&page={page}"
-        r = _get(url)
+        r = await _get(client, url)
         if r.status_code != 200:
             break
         try:
@@ -61,7 +65,7 @@ def paginate_products_json(base: str, limit: int = 250, max_pages: int = 50) ->
         if len(batch) < limit:
             break
         page += 1
-        time.sleep(0.3)
+        await asyncio.sleep(0.3)
     return products
 
 def parse_product_json(pj: dict, base: str) -> Product:
@@ -151,13 +155,41 @@ def get_hero_products(base: str, html: str) -> list[Product]:
             break
     return prods
 
-def fetch_page(url: str) -> tuple[int, str]:
-    r = _get(url)
-    return r.status_code, r.text if r.ok else ''
+# 404 is cached as a negative result; rate limits, bot blocks and other
+# transient statuses are always refetched.
+CACHEABLE_STATUSES = {200, 404}
+
+async def fetch_page(client: httpx.AsyncClient, url: str) -> tuple[int, str]:
+    # SQLite calls go through a thread so a busy cache file never stalls the loop.
+    if cache.enabled():
+        hit = await asyncio.to_thread(cache.get_page, url)
+        if hit:
+            cache.incr('page_cache_hits')
+            return hit
+        cache.incr('page_cache_misses')
+    r = await _get(client, url)
+    status, text = r.status_code, r.text if r.status_code < 400 else ''
+    if status in CACHEABLE_STATUSES and cache.enabled():
+        await asyncio.to_thread(cache.put_page, url, status, text)
+    return status, text
+
+def parse_homepage(base: str, html: str) -> tuple[dict[str,str], list[Product], str | None, SocialHandles, str]:
+    # Everything derived from the homepage, computed in a single pool task so the
+    # HTML is shipped to the worker process once.
+    links = discover_links(base, html)
+    try:
+        hero, hero_error = get_hero_products(base, html)[:12], None
+    except Exception as e:
+        hero, hero_error = [], str(e)
+    return links, hero, hero_error, extract_socials(html), clean_text(html)
+
+async def analyze_store(website_url: str, include_competitors: bool = False) -> BrandContext:
+    async with _client() as client:
+        return await _analyze_store(client, website_url)
 
-def analyze_store(website_url: str, include_competitors: bool = False) -> BrandContext:
+async def _analyze_store(client: httpx.AsyncClient, website_url: str) -> BrandContext:
     base = normalize_base(website_url)
-    status, html = fetch_page(base)
+    status, html = await fetch_page(client, base)
     if status == 404:
         raise FileNotFoundError('Website not found (404)')
     if status >= 500 or not html:
@@ -167,19 +199,18 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
     ctx = BrandContext(brand=brand_name, website_url=base)
     ctx.raw_notes['shopify_like'] = str(is_shopify_store(html))
 
-    links = discover_links(base, html)
+    links, hero, hero_error, socials, home_text = await run_cpu(parse_homepage, base, html)
 
     try:
-        pj = paginate_products_json(base)
+        pj = await paginate_products_json(client, base)
         ctx.whole_catalog = [parse_product_json(p, base) for p in pj]
         ctx.raw_notes['product_count'] = str(len(ctx.whole_catalog))
     except Exception as e:
         ctx.raw_notes['products_error'] = str(e)
 
-    try:
-        ctx.hero_products = get_hero_products(base, html)[:12]
-    except Exception as e:
-        ctx.raw_notes['hero_error'] = str(e)
+    ctx.hero_products = hero
+    if hero_error:
+        ctx.raw_notes['hero_error'] = hero_error
 
     policies = {}
     for cand in [
@@ -189,9 +220,9 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
         '/pages/terms-of-service','/pages/shipping-policy'
     ]:
         url = urljoin(base, cand)
-        s, t = fetch_page(url)
+        s, t = await fetch_page(client, url)
         if s == 200 and t:
-            text = clean_text(t)
+            text = await run_cpu(clean_text, t)
             if 'privacy' in cand and 'privacy' in text.lower():
                 policies['privacy_policy'] = url
             if 'refund' in cand and 'refund' in text.lower():
@@ -219,13 +250,13 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
         if u: policies['shipping_policy'] = u
     ctx.policy_links = PolicyLinks(**policies)
 
-    ctx.socials = extract_socials(html)
+    ctx.socials = socials
 
     important = {}
     u = find_by_keywords(links, ['track','order tracking'])
     if not u:
         for cand in ['/pages/track-order','/pages/order-tracking','/tools/track','/a/track']:
-            s, t = fetch_page(urljoin(base, cand))
+            s, t = await fetch_page(client, urljoin(base, cand))
             if s == 200:
                 u = urljoin(base, cand); break
     if u: important['order_tracking'] = u
@@ -233,7 +264,7 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
     u = find_by_keywords(links, ['blog'])
     if not u:
         for cand in ['/blogs','/blogs/news']:
-            s, t = fetch_page(urljoin(base, cand))
+            s, t = await fetch_page(client, urljoin(base, cand))
             if s == 200:
                 u = urljoin(base, cand); break
     if u: important['blogs'] = u
@@ -241,7 +272,7 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
     u = find_by_keywords(links, ['contact'])
     if not u:
         for cand in ['/pages/contact','/pages/contact-us','/contact']:
-            s, t = fetch_page(urljoin(base, cand))
+            s, t = await fetch_page(client, urljoin(base, cand))
             if s == 200:
                 u = urljoin(base, cand); break
     if u: important['contact_us'] = u
@@ -250,23 +281,23 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
     u = find_by_keywords(links, ['about','our story','story'])
     if not u:
         for cand in ['/pages/about','/pages/about-us','/pages/our-story','/pages/story']:
-            s, t = fetch_page(urljoin(base, cand))
+            s, t = await fetch_page(client, urljoin(base, cand))
             if s == 200:
                 u = urljoin(base, cand); break
     if u:
         important['about'] = u
-        s, t = fetch_page(u)
+        s, t = await fetch_page(client, u)
         if s == 200:
-            about = clean_text(t)[:5000]
+            about = (await run_cpu(clean_text, t))[:5000]
     ctx.about_text = about
     ctx.important_links = ImportantLinks(**important)
 
     contact = Contact()
-    pages_to_scan = [html]
+    texts = [home_text]
     if ctx.important_links.contact_us:
-        s, t = fetch_page(str(ctx.important_links.contact_us))
-        if s == 200: pages_to_scan.append(t)
-    text_all = ' '.join(clean_text(p) for p in pages_to_scan)
+        s, t = await fetch_page(client, str(ctx.important_links.contact_us))
+        if s == 200: texts.append(await run_cpu(clean_text, t))
+    text_all = ' '.join(texts)
     contact.emails = extract_emails(text_all)
     contact.phones = extract_phones(text_all)
     contact.contact_page = ctx.important_links.contact_us
@@ -282,9 +313,9 @@ def analyze_store(website_url: str, include_competitors: bool = False) -> BrandC
     for u in faq_urls[:5]:
         if u in seen: continue
         seen.add(u)
-        s, t = fetch_page(u)
+        s, t = await fetch_page(client, u)
         if s != 200 or not t: continue
-        pairs = find_faq_pairs(t)
+        pairs = await run_cpu(find_faq_pairs, t)
         for q,a in pairs[:50]:
             faqs.append(FAQ(question=q, answer=a, url=u))
         if len(faqs) >= 50: break
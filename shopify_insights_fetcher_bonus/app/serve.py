@@ -0,0 +1,52 @@
+from __future__ import annotations
+import argparse, os, signal, sys, tempfile
+import uvicorn
+from .config import settings
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def plan(workers: int = 0, parse_processes: int | None = None, cores: int | None = None) -> tuple[int, int]:
+    if workers < 0 or (parse_processes is not None and parse_processes < 0):
+        raise ValueError('workers and parse processes must be >= 0')
+    cores = cores or available_cores()
+    # Workers mostly wait on the network, parse processes burn CPU: by default use
+    # half the cores for workers and share the rest out between their parse pools,
+    # so workers * (1 + parse_processes) stays within the core count.
+    workers = workers or max(1, cores // 2)
+    if parse_processes is None:
+        parse_processes = max(0, cores - workers) // workers
+    return workers, parse_processes
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the insights fetcher with multiple workers.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=settings.WORKERS, help='0 = half the available cores')
+    parser.add_argument('--parse-processes', type=int, default=None, help='parse pool size per worker')
+    args = parser.parse_args()
+
+    try:
+        workers, parse_processes = plan(args.workers, args.parse_processes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # uvicorn re-raises SIGTERM once it has shut down; exit normally instead so
+    # the temporary cache directory below is cleaned up.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(128 + signal.SIGTERM))
+    with tempfile.TemporaryDirectory(prefix='shopify_insights_') as tmp:
+        cache_path = settings.CACHE_PATH or os.path.join(tmp, 'cache.sqlite3')
+        # A single worker runs in this process and reuses the already-built
+        # settings; spawned workers rebuild them from the environment.
+        settings.PARSE_PROCESSES = parse_processes
+        settings.CACHE_PATH = cache_path
+        os.environ['PARSE_PROCESSES'] = str(parse_processes)
+        os.environ['CACHE_PATH'] = cache_path
+        uvicorn.run('app.main:app', host=args.host, port=args.port, workers=workers,
+                    log_level=settings.LOG_LEVEL.lower())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import sqlite3, threading, time
+from collections import Counter
+
+# Cache writes give up quickly on a locked file instead of stalling the request.
+BUSY_TIMEOUT = 0.1
+INIT_TIMEOUT = 10
+
+_local = threading.local()
+_lock = threading.Lock()
+_conns: list[sqlite3.Connection] = []
+_generation = 0
+_pending: Counter[str] = Counter()
+_now = time.time
+
+path: str | None = None
+ttl: int = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_expires ON pages (expires);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+def init_cache(cache_path: str | None, cache_ttl: int = 900):
+    global path, ttl
+    close()
+    path, ttl = cache_path, cache_ttl
+    with _lock:
+        _pending.clear()
+    if path:
+        # Startup may race the other workers, so wait longer here than on requests.
+        db = sqlite3.connect(path, timeout=INIT_TIMEOUT)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            db.execute("DELETE FROM pages WHERE expires < ?", (_now(),))
+            db.commit()
+        finally:
+            db.close()
+    return path
+
+def close():
+    # Connections belong to whichever threads opened them; bumping the
+    # generation makes those threads reconnect on their next call.
+    global _generation
+    with _lock:
+        conns = _conns[:]
+        _conns.clear()
+        _generation += 1
+    for db in conns:
+        db.close()
+
+def enabled() -> bool:
+    return bool(path) and ttl > 0
+
+def _conn() -> sqlite3.Connection:
+    # sqlite3 connections must not be shared across threads, so keep one per thread.
+    db = getattr(_local, 'db', None)
+    if db is None or _local.generation != _generation:
+        db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        db.execute("PRAGMA synchronous=NORMAL")
+        with _lock:
+            _conns.append(db)
+            _local.db, _local.generation = db, _generation
+    return db
+
+# The cache is best-effort: a locked or broken file counts as a miss and
+# skipped writes, never as a failed request.
+
+def get_page(url: str) -> tuple[int, str] | None:
+    if not enabled():
+        return None
+    try:
+        row = _conn().execute("SELECT status, body, expires FROM pages WHERE url = ?", (url,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if not row or row[2] < _now():
+        return None
+    return row[0], row[1]
+
+def put_page(url: str, status: int, body: str):
+    if not enabled():
+        return
+    now = _now()
+    try:
+        with _conn() as db:
+            db.execute("DELETE FROM pages WHERE expires < ?", (now,))
+            db.execute(
+                "INSERT OR REPLACE INTO pages (url, status, body, expires) VALUES (?, ?, ?, ?)",
+                (url, status, body, now + ttl),
+            )
+    except sqlite3.Error:
+        pass
+
+def incr(name: str, n: int = 1):
+    # Counted in memory; flush_metrics() moves the totals into the shared file.
+    with _lock:
+        _pending[name] += n
+
+def flush_metrics() -> bool:
+    if not path:
+        return True
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+    if not batch:
+        return True
+    try:
+        with _conn() as db:
+            db.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                batch.items(),
+            )
+        return True
+    except sqlite3.Error:
+        with _lock:
+            _pending.update(batch)
+        return False
+
+def metrics() -> dict[str, int]:
+    if not path:
+        with _lock:
+            return dict(_pending)
+    flush_metrics()
+    totals: Counter[str] = Counter()
+    try:
+        totals.update(dict(_conn().execute("SELECT name, value FROM counters").fetchall()))
+    except sqlite3.Error:
+        pass
+    with _lock:
+        totals.update(_pending)  # whatever could not be flushed just now
+    return dict(sorted(totals.items()))
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import asyncio, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+executor: ProcessPoolExecutor | None = None
+_max_workers = 0
+
+def _mp_context():
+    # Children are started from a multi-threaded worker, where fork is unsafe;
+    # forkserver/spawn start them from a clean interpreter.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def init_pool(max_workers: int) -> ProcessPoolExecutor | None:
+    global executor, _max_workers
+    shutdown_pool()
+    _max_workers = max_workers
+    if max_workers > 0:
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context())
+    return executor
+
+def shutdown_pool():
+    global executor
+    if executor:
+        executor.shutdown(cancel_futures=True)
+    executor = None
+
+async def run_cpu(fn: Callable[..., T], *args) -> T:
+    # BeautifulSoup parsing is CPU-bound and holds the GIL. With a pool it runs in
+    # another process and the event loop only awaits the result; without one it
+    # runs on a thread so it never blocks the loop.
+    pool = executor
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A child died (e.g. OOM on a huge page); replace the pool for later
+        # calls and finish this one on a thread.
+        if executor is pool:
+            init_pool(_max_workers)
+        return await asyncio.to_thread(fn, *args)
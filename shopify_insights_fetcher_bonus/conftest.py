@@ -0,0 +1,4 @@
+import os, sys
+
+# Lets `pytest` find the `app` package from this directory or the repo root.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,103 @@
+import asyncio, os, sqlite3, subprocess, sys, time
+import pytest
+from app.utils import cache
+from app.scraper import shopify_scraper
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+
+def fake_get(status, text='body'):
+    async def _get(client, url):
+        return FakeResponse(status, text)
+    return _get
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    cache.init_cache(str(tmp_path / 'cache.sqlite3'), 60)
+    yield cache
+    cache.init_cache(None)
+
+@pytest.mark.parametrize('status,cached', [(200, True), (404, True), (403, False), (429, False), (503, False)])
+def test_fetch_page_caches_only_stable_statuses(shared_cache, monkeypatch, status, cached):
+    monkeypatch.setattr(shopify_scraper, '_get', fake_get(status))
+    asyncio.run(shopify_scraper.fetch_page(None, 'https://shop.example/x'))
+    assert (cache.get_page('https://shop.example/x') is not None) == cached
+
+def test_fetch_page_counts_hits_and_misses(shared_cache, monkeypatch):
+    monkeypatch.setattr(shopify_scraper, '_get', fake_get(200))
+    for _ in range(2):
+        asyncio.run(shopify_scraper.fetch_page(None, 'https://shop.example/x'))
+    assert cache.metrics() == {'page_cache_hits': 1, 'page_cache_misses': 1}
+
+@pytest.mark.parametrize('cache_path,cache_ttl', [(None, 60), ('cache.sqlite3', 0)])
+def test_fetch_page_no_cache_counters_when_disabled(tmp_path, monkeypatch, cache_path, cache_ttl):
+    cache.init_cache(cache_path and str(tmp_path / cache_path), cache_ttl)
+    monkeypatch.setattr(shopify_scraper, '_get', fake_get(200))
+    try:
+        asyncio.run(shopify_scraper.fetch_page(None, 'https://shop.example/x'))
+        assert cache.metrics() == {}
+    finally:
+        cache.init_cache(None)
+
+def test_expired_pages_are_missed_and_purged(shared_cache, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(cache, '_now', lambda: now)
+    cache.put_page('a', 200, 'old')
+    assert cache.get_page('a') == (200, 'old')
+    now += 61
+    assert cache.get_page('a') is None
+    cache.put_page('b', 200, 'new')
+    assert cache._conn().execute("SELECT url FROM pages").fetchall() == [('b',)]
+
+def test_zero_ttl_disables_reads(shared_cache):
+    cache.put_page('a', 200, 'x')
+    cache.ttl = 0
+    assert cache.get_page('a') is None
+
+def test_counters_aggregate_across_workers(shared_cache):
+    cache.incr('hits')
+    cache.incr('hits', 2)
+    # A second worker process flushing its own counters into the same file.
+    other = (
+        "from app.utils import cache; "
+        f"cache.init_cache({cache.path!r}, 60); cache.incr('hits', 4); cache.incr('errors'); "
+        "assert cache.flush_metrics()"
+    )
+    subprocess.run([sys.executable, '-c', other], cwd=PACKAGE_DIR, check=True)
+    assert cache.metrics() == {'errors': 1, 'hits': 7}
+
+def test_sqlite_errors_do_not_raise(shared_cache):
+    cache._conn().close()  # every later query raises sqlite3.ProgrammingError
+    assert cache.get_page('a') is None
+    cache.put_page('a', 200, 'x')
+    cache.incr('hits')
+    assert not cache.flush_metrics()
+    assert cache.metrics() == {'hits': 1}
+
+def test_locked_file_is_skipped_quickly(shared_cache):
+    blocker = sqlite3.connect(cache.path)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        cache.incr('hits')
+        start = time.monotonic()
+        cache.put_page('a', 200, 'x')
+        assert not cache.flush_metrics()
+        assert time.monotonic() - start < 2
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert cache.flush_metrics()
+    assert cache.metrics() == {'hits': 1}
+
+def test_init_cache_invalidates_other_threads(shared_cache, tmp_path):
+    import threading
+    conns = []
+    t = threading.Thread(target=lambda: conns.append(cache._conn()))
+    t.start(); t.join()
+    cache.init_cache(str(tmp_path / 'other.sqlite3'), 60)
+    with pytest.raises(sqlite3.ProgrammingError):
+        conns[0].execute("SELECT 1")
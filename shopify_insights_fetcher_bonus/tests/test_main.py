@@ -0,0 +1,53 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.scraper import shopify_scraper
+from app.utils import cache, pool
+
+PAGES = {
+    'https://shop.example': '<html><a href="/products/tee">Tee</a> cdn.shopify.com hi@shop.example</html>',
+    'https://shop.example/products.json?limit=250&page=1': json.dumps({'products': [
+        {'id': 1, 'title': 'Tee', 'handle': 'tee', 'variants': [{'price': '10.0', 'available': True}]},
+    ]}),
+}
+
+class FakeResponse:
+    def __init__(self, url):
+        self.status_code = 200 if url in PAGES else 404
+        self.text = PAGES.get(url, '')
+
+    def json(self):
+        return json.loads(self.text)
+
+async def fake_get(client, url):
+    return FakeResponse(url)
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'PARSE_PROCESSES', 1)
+    monkeypatch.setattr(settings, 'CACHE_PATH', str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(shopify_scraper, '_get', fake_get)
+    with TestClient(app) as c:
+        assert pool.executor is not None
+        yield c
+    assert pool.executor is None
+    cache.init_cache(None)
+
+def test_analyze_and_metrics(client):
+    r = client.post('/analyze', json={'website_url': 'https://shop.example'})
+    assert r.status_code == 200
+    body = r.json()
+    assert [p['handle'] for p in body['whole_catalog']] == ['tee']
+    assert [p['handle'] for p in body['hero_products']] == ['tee']
+    assert body['contact']['emails'] == ['hi@shop.example']
+
+    metrics = client.get('/metrics').json()
+    assert metrics['analyze_requests'] == 1
+    assert metrics['page_cache_misses'] > 0
+
+def test_analyze_not_found(client):
+    r = client.post('/analyze', json={'website_url': 'https://missing.example'})
+    assert r.status_code == 401
+    assert client.get('/metrics').json()['analyze_not_found'] == 1
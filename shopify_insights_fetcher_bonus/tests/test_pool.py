@@ -0,0 +1,39 @@
+import asyncio
+from app.utils import pool
+from app.scraper.shopify_scraper import parse_homepage
+
+HOMEPAGE = (
+    '<html><a href="/products/tee">Tee</a><a href="https://instagram.com/shop">ig</a>'
+    '<a href="/pages/contact">Contact</a><script>x</script> hi@shop.example</html>'
+)
+
+def test_run_cpu_inline_when_disabled():
+    assert pool.init_pool(0) is None
+    assert asyncio.run(pool.run_cpu(sum, [1, 2, 3])) == 6
+
+def test_parse_homepage_in_pool():
+    pool.init_pool(1)
+    try:
+        links, hero, hero_error, socials, text = asyncio.run(
+            pool.run_cpu(parse_homepage, 'https://shop.example', HOMEPAGE))
+    finally:
+        pool.shutdown_pool()
+    assert links['https://shop.example/pages/contact'] == 'contact'
+    assert [p.handle for p in hero] == ['tee'] and hero_error is None
+    assert str(socials.instagram) == 'https://instagram.com/shop'
+    assert text == 'Tee ig Contact hi@shop.example'
+
+def _die_in_child(x):
+    import multiprocessing, os
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return x
+
+def test_run_cpu_recovers_from_broken_pool():
+    broken = pool.init_pool(1)
+    try:
+        assert asyncio.run(pool.run_cpu(_die_in_child, 5)) == 5
+        assert pool.executor is not None and pool.executor is not broken
+        assert asyncio.run(pool.run_cpu(sum, [1, 2])) == 3
+    finally:
+        pool.shutdown_pool()
@@ -0,0 +1,20 @@
+import pytest
+from app.serve import plan
+
+def test_plan_defaults_fit_cores():
+    assert plan(cores=8) == (4, 1)
+    assert plan(cores=1) == (1, 0)
+    for cores in (1, 2, 3, 8, 16):
+        workers, parse = plan(cores=cores)
+        assert workers * (1 + parse) <= cores
+
+def test_plan_explicit_values():
+    assert plan(2, cores=8) == (2, 3)
+    assert plan(8, cores=8) == (8, 0)
+    assert plan(2, 5, cores=8) == (2, 5)
+
+def test_plan_rejects_negative():
+    with pytest.raises(ValueError):
+        plan(-1, cores=4)
+    with pytest.raises(ValueError):
+        plan(0, -1, cores=4)